@@ -1,17 +1,60 @@
 from __future__ import annotations
+import atexit
+import concurrent.futures
 import os
 import requests
 import smtplib
+import threading
+import time
 from email.message import EmailMessage
 from .log import get_logger
 from . import config  # ensure .env is loaded via load_dotenv()
 
+# orjson serializes several times faster than stdlib json; fall back
+# silently when it isn't installed.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 log = get_logger("alerts")
 
 TELEGRAM_API_BASE = "https://api.telegram.org"
 
+_TG_HEADERS = {"Content-Type": "application/json"}
+
+# Shared session so bursts of alerts reuse one TLS connection to the
+# Telegram API instead of handshaking per message.
+_TG_SESSION = requests.Session()
+_TG_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Alert delivery runs off-thread so callers don't block for up to 10-15s on
+# slow network/SMTP. Pending sends are flushed on interpreter exit.
+_ALERT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="alerts")
+atexit.register(_ALERT_POOL.shutdown, wait=True)
+
+# Per-thread SMTP connection cache (see _get_smtp)
+_smtp_local = threading.local()
+_SMTP_IDLE_TTL = 90.0  # seconds before an idle connection is considered stale
+
 
 def send_telegram_message(text: str) -> None:
+    """Queue a Telegram message for background delivery (returns immediately)."""
+    _ALERT_POOL.submit(_send_telegram_sync, text)
+
+
+def send_email_alert(subject: str, body: str) -> None:
+    """Queue an email alert for background delivery (returns immediately)."""
+    _ALERT_POOL.submit(_send_email_sync, subject, body)
+
+
+def _send_telegram_sync(text: str) -> None:
     """Send a plain text message via Telegram Bot API using env vars.
 
     Required env vars:
@@ -27,7 +70,7 @@ def send_telegram_message(text: str) -> None:
     url = f"{TELEGRAM_API_BASE}/bot{token}/sendMessage"
     payload = {"chat_id": chat_id, "text": text, "disable_web_page_preview": True}
     try:
-        r = requests.post(url, json=payload, timeout=10)
+        r = _TG_SESSION.post(url, data=_json_dumps(payload), headers=_TG_HEADERS, timeout=(3, 10))
         if r.status_code != 200:
             log.warning("Telegram send failed: %s %s", r.status_code, r.text[:200])
         else:
@@ -36,7 +79,7 @@ def send_telegram_message(text: str) -> None:
         log.warning("Telegram send exception: %r", e)
 
 
-def send_email_alert(subject: str, body: str) -> None:
+def _send_email_sync(subject: str, body: str) -> None:
     """Send a plain text email using SMTP with env vars.
 
     Required env vars:
@@ -66,14 +109,51 @@ def send_email_alert(subject: str, body: str) -> None:
     msg.set_content(body)
 
     try:
-        if use_tls:
-            server = smtplib.SMTP(host, port, timeout=15)
-            server.starttls()
-        else:
-            server = smtplib.SMTP(host, port, timeout=15)
-        server.login(user, pwd)
-        server.send_message(msg)
-        server.quit()
+        conn = _get_smtp(host, port, user, pwd, use_tls)
+        conn.send_message(msg)
+        _smtp_local.last_used = time.monotonic()
         log.info("Email alert sent to %s", to_addrs)
     except Exception as e:
         log.warning("Email send exception: %r", e)
+        _drop_smtp()
+
+
+def _get_smtp(host: str, port: int, user: str, pwd: str, use_tls: bool) -> smtplib.SMTP:
+    """Return a cached SMTP connection, rebuilding it when stale or dead.
+
+    Keeping the connection alive skips the TCP + STARTTLS + AUTH handshake
+    on every alert. The cache is per-thread (alerts run on the pool), keyed
+    implicitly by the env config, validated with RSET, and dropped after
+    _SMTP_IDLE_TTL seconds idle since many servers close quiet sessions.
+    """
+    key = (host, port, user)
+    conn = getattr(_smtp_local, "conn", None)
+    if conn is not None and getattr(_smtp_local, "key", None) == key:
+        idle = time.monotonic() - getattr(_smtp_local, "last_used", 0.0)
+        if idle < _SMTP_IDLE_TTL:
+            try:
+                conn.rset()
+                return conn
+            except Exception:
+                pass
+        _drop_smtp()
+
+    conn = smtplib.SMTP(host, port, timeout=15)
+    if use_tls:
+        conn.starttls()
+    conn.login(user, pwd)
+    _smtp_local.conn = conn
+    _smtp_local.key = key
+    _smtp_local.last_used = time.monotonic()
+    return conn
+
+
+def _drop_smtp() -> None:
+    """Close and forget the cached SMTP connection (best effort)."""
+    conn = getattr(_smtp_local, "conn", None)
+    _smtp_local.conn = None
+    if conn is not None:
+        try:
+            conn.quit()
+        except Exception:
+            pass
@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 
 try:
     from dotenv import load_dotenv
@@ -15,3 +16,41 @@ USER_AGENT = os.getenv(
 REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "10"))
 RETRY_COUNT = int(os.getenv("RETRY_COUNT", "3"))
 RETRY_BACKOFF = float(os.getenv("RETRY_BACKOFF", "0.7"))
+
+# Sidecar-cache directory, anchored to the repo root (one level above this
+# package) so scheduled runs launched from any working directory read and
+# write the same files. Also keeps them under the repo-root .gitignore entry.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    val = os.getenv(name)
+    if val is None:
+        return default
+    return val.strip().lower() in ("1", "true", "yes", "y")
+
+
+@dataclass(frozen=True)
+class Config:
+    """Env-derived flags parsed once instead of re-read on every cycle."""
+
+    write_on_change_only: bool
+    notify_email: bool
+    digest_hours: int
+
+
+def _load_config() -> Config:
+    return Config(
+        write_on_change_only=_env_bool("WRITE_ON_CHANGE_ONLY"),
+        notify_email=_env_bool("NOTIFY_EMAIL"),
+        digest_hours=int(os.getenv("DIGEST_HOURS", "24")),
+    )
+
+
+CFG = _load_config()
+
+
+def reload_config() -> None:
+    """Re-read the env-derived flags (after monkeypatching env in tests)."""
+    global CFG
+    CFG = _load_config()
@@ -19,6 +19,7 @@ import io
 import time
 import datetime as dt
 from typing import List, Dict
+from urllib.parse import quote
 
 import pandas as pd
 import streamlit as st
@@ -42,44 +43,128 @@ from src.sheets import _get_client, _get_all_rows, export_sheet_to_csv  # type:
 
 # ---- Helpers -----------------------------------------------------------------
 
+# st.cache_data is per-process; a parquet snapshot on disk lets a restarted
+# or freshly spawned Streamlit worker skip the full sheet download.
+_DISK_CACHE_DIR = os.path.join(_sys_root, ".cache")
+_DISK_CACHE_TTL = 600  # seconds
+
+
+def _disk_cache_path(sheet_id: str, sheet_name: str) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in sheet_name)
+    return os.path.join(_DISK_CACHE_DIR, f"{sheet_id}_{safe}.parquet")
+
+
+def _read_disk_cache(path: str) -> pd.DataFrame | None:
+    try:
+        if os.path.exists(path) and (time.time() - os.path.getmtime(path)) < _DISK_CACHE_TTL:
+            return pd.read_parquet(path)
+    except Exception:
+        pass
+    return None
+
+
+def _write_disk_cache(path: str, df: pd.DataFrame) -> None:
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        import tempfile
+        fd, tmp = tempfile.mkstemp(dir=_DISK_CACHE_DIR, suffix=".parquet")
+        os.close(fd)
+        df.to_parquet(tmp, compression="zstd")
+        os.replace(tmp, path)  # atomic swap so readers never see a partial file
+    except Exception:
+        pass  # cache is best-effort; never break the dashboard over it
+
+
+# Above this row count the Arrow compute kernels beat the pandas string
+# path; below it the conversion overhead isn't worth it.
+_ARROW_PRICE_THRESHOLD = 10_000
+
+
+def _clean_price_series(s: pd.Series) -> pd.Series:
+    """Strip currency symbols/letters from a price column and coerce to float.
+
+    Large columns go through pyarrow's regex-replace + cast kernels (one
+    C pass, no intermediate StringArray); small ones — and anything the
+    Arrow cast chokes on — use the equivalent pandas expression.
+    """
+    if len(s) >= _ARROW_PRICE_THRESHOLD:
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+
+            arr = pa.array(s.astype("string"), type=pa.string())
+            cleaned = pc.replace_substring_regex(arr, pattern=r"[^0-9.\-]", replacement="")
+            cleaned = pc.if_else(pc.equal(cleaned, ""), pa.nulls(len(cleaned), pa.string()), cleaned)
+            floats = pc.cast(cleaned, pa.float64())
+            return pd.Series(floats.to_pandas(), index=s.index)
+        except Exception:
+            pass  # malformed cells fail the strict Arrow cast → pandas coerce
+    return pd.to_numeric(
+        s.astype("string").str.replace(r"[^\d.\-]", "", regex=True),
+        errors="coerce",
+    )
+
+
 @st.cache_data(show_spinner=False, ttl=60)
 def load_sheet(sheet_name: str) -> pd.DataFrame:
     """Load an entire worksheet into a pandas DataFrame.
     Expects first row to be header. Returns empty DF on failure.
+
+    Tries the lightweight CSV export endpoint first (one gzipped GET, no
+    Sheets API quota); falls back to the gspread API path for private
+    sheets where the export URL is not accessible.
     """
     sheet_id = os.getenv("GOOGLE_SHEET_ID")
     if not sheet_id:
         st.error("GOOGLE_SHEET_ID is not set in .env")
         return pd.DataFrame()
 
+    cache_path = _disk_cache_path(sheet_id, sheet_name)
+    cached = _read_disk_cache(cache_path)
+    if cached is not None:
+        return cached
+
+    df = None
     try:
-        client = _get_client()
-        sh = client.open_by_key(sheet_id)
-        ws = sh.worksheet(sheet_name)
-        rows = _get_all_rows(ws)
-        if not rows:
+        csv_url = (
+            f"https://docs.google.com/spreadsheets/d/{sheet_id}"
+            f"/gviz/tq?tqx=out:csv&sheet={quote(sheet_name)}"
+        )
+        df = pd.read_csv(csv_url)
+    except Exception:
+        df = None  # private sheet or export disabled → use the API path
+
+    if df is None:
+        try:
+            client = _get_client()
+            sh = client.open_by_key(sheet_id)
+            ws = sh.worksheet(sheet_name)
+            rows = _get_all_rows(ws)
+            if not rows:
+                return pd.DataFrame()
+            header, *data = rows
+            df = pd.DataFrame(data, columns=header)
+        except Exception as e:
+            st.exception(e)
             return pd.DataFrame()
-        header, *data = rows
-        df = pd.DataFrame(data, columns=header)
-    except Exception as e:
-        st.exception(e)
-        return pd.DataFrame()
 
     # Normalize common columns if present
     for col in ["timestamp", "created_at", "time"]:
         if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce")
+            # Snapshots are written as ISO8601; the explicit format keeps
+            # parsing on the C fast path instead of per-row dateutil.
+            parsed = pd.to_datetime(df[col], format="ISO8601", errors="coerce", utc=True, cache=True)
+            if parsed.isna().any():
+                # Mixed/legacy formats: re-try only via the generic parser
+                parsed = parsed.combine_first(pd.to_datetime(df[col], errors="coerce", utc=True))
+            df[col] = parsed
             break  # prefer the first matching timestamp column
 
-    # Normalize price-like columns (best-effort, any currency)
-    for pcol in [c for c in df.columns if "price" in c.lower()]:
-        # remove any currency symbols and letters, keep digits, dot and minus
-        cleaned = (
-            df[pcol]
-            .astype(str)
-            .str.replace(r"[^0-9.\-]", "", regex=True)
-        )
-        df[pcol] = pd.to_numeric(cleaned, errors="coerce")
+    # Normalize price-like columns (best-effort, any currency): strip
+    # everything but digits, dot and minus in a single vectorized pass.
+    price_cols = [c for c in df.columns if "price" in c.lower()]
+    if price_cols:
+        df[price_cols] = df[price_cols].apply(_clean_price_series)
 
     # Try to ensure a URL column exists for filtering
     if "url" not in df.columns:
@@ -89,6 +174,20 @@ def load_sheet(sheet_name: str) -> pd.DataFrame:
                 df.rename(columns={cand: "url"}, inplace=True)
                 break
 
+    # Sort by time once and index by url inside the cache, so every rerun
+    # of the script can slice with searchsorted / index lookups instead of
+    # re-scanning the whole frame with boolean masks.
+    ts_col = next((c for c in ("timestamp", "created_at", "time") if c in df.columns), None)
+    if ts_col is not None:
+        df = df.sort_values(ts_col)
+    if "url" in df.columns:
+        # Categorical: dedupes the repeated URL strings and makes isin /
+        # unique operate on integer codes; categories come back sorted.
+        df["url"] = df["url"].astype("category")
+        df = df.set_index("url", drop=False)
+        df.index.name = None
+
+    _write_disk_cache(cache_path, df)
     return df
 
 
@@ -140,18 +239,29 @@ for c in ("timestamp", "created_at", "time"):
         break
 
 if ts_col:
-    cutoff = dt.datetime.utcnow() - dt.timedelta(hours=since_hours)
-    df = _df[_df[ts_col] >= cutoff]
+    # Stay in pandas datetime64 (tz-aware) space to match the parsed column
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=since_hours)
+    if _df[ts_col].is_monotonic_increasing:
+        # Loader pre-sorts by time: binary-search the cutoff instead of masking
+        df = _df.iloc[_df[ts_col].searchsorted(cutoff):]
+    else:
+        df = _df[_df[ts_col] >= cutoff]
 else:
     df = _df.copy()
 
 # URL filter
 url_options: List[str] = []
 if "url" in df.columns:
-    url_options = sorted([u for u in df["url"].dropna().unique().tolist()])
+    if isinstance(df["url"].dtype, pd.CategoricalDtype):
+        # Unobserved categories survive the time slice above — drop them so
+        # the options (and the [:3] default) only offer URLs in view
+        url_options = df["url"].cat.remove_unused_categories().cat.categories.tolist()
+    else:
+        url_options = sorted([u for u in df["url"].dropna().unique().tolist()])
 selected_urls = st.multiselect("Filter by URL(s)", options=url_options, default=url_options[:3])
 if selected_urls:
-    df = df[df["url"].isin(selected_urls)]
+    # url is the index (see load_sheet); index isin uses the hash engine
+    df = df.loc[df.index.isin(selected_urls)]
 
 # Metrics row
 col1, col2, col3 = st.columns(3)
@@ -171,7 +281,7 @@ if "url" in df.columns and len(url_options) > 0:
 
 price_cols = [c for c in df.columns if "price" in c.lower()]
 if chart_url and price_cols:
-    sel = df[df.get("url", pd.Series([], dtype=str)) == chart_url].copy()
+    sel = df.loc[df.index.isin([chart_url])].copy()
     if ts_col:
         chart_df = sel[[ts_col] + price_cols].sort_values(ts_col)
         chart_df = chart_df.set_index(ts_col)
@@ -186,7 +296,12 @@ else:
     st.caption("Add a price column (e.g., `price` or `price_usd`). For time axis, include a timestamp column; otherwise we show a last-50 trend by row order.")
 
 st.subheader("Recent rows")
-st.dataframe(df.sort_values(ts_col or df.columns[0], ascending=False).head(500), use_container_width=True)
+if ts_col:
+    # Partial selection of the newest 500 rows — avoids a full sort
+    recent = df.nlargest(500, ts_col)
+else:
+    recent = df.sort_values(df.columns[0], ascending=False).head(500)
+st.dataframe(recent, use_container_width=True)
 
 st.divider()
 
@@ -197,14 +312,14 @@ with col_a:
     export_name = st.text_input("CSV filename", value=f"{sheet_name.lower()}_export.csv")
     if st.button("⬇️ Export current sheet to CSV", use_container_width=True):
         try:
-            # Use the shared helper to export to disk, then offer download
-            rc = export_sheet_to_csv(sheet_name=sheet_name, out_path=export_name, since_hours=None)
-            if rc == 0 and os.path.exists(export_name):
-                with open(export_name, "rb") as f:
-                    st.download_button("Download CSV", data=f.read(), file_name=export_name, mime="text/csv", use_container_width=True)
-                st.success(f"Exported to {export_name}")
+            # Export straight into memory — no disk round-trip before download
+            buf = io.BytesIO()
+            rc = export_sheet_to_csv(sheet_name=sheet_name, buffer=buf, since_hours=None)
+            if rc == 0 and buf.tell() > 0:
+                st.download_button("Download CSV", data=buf.getvalue(), file_name=export_name, mime="text/csv", use_container_width=True)
+                st.success(f"Prepared {export_name} for download")
             else:
-                st.warning("Export finished but no file was produced.")
+                st.warning("Export finished but no data was produced.")
         except Exception as e:
             st.exception(e)
 
@@ -1,12 +1,40 @@
 from __future__ import annotations
 import os
 import re
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
 Product = Dict[str, Optional[str]]
 
 TRUTHY = {"1", "true", "yes", "y", "on"}
 
+_PRICE_RE = re.compile(r"[^0-9.,]")
+
+
+def _env_price_delta_pct() -> float:
+    try:
+        return float(os.getenv("PRICE_DELTA_PCT", "0").strip() or "0")
+    except ValueError:
+        return 0.0
+
+
+def _env_alert_on_avail() -> bool:
+    return os.getenv("ALERT_ON_AVAILABILITY", "true").strip().lower() in TRUTHY
+
+
+# Defaults read once at import so the per-product diff avoids two getenv
+# calls plus string parsing per call. Call reload_config() after mutating
+# the environment at runtime (tests, SIGHUP-style reconfiguration).
+_PRICE_DELTA_PCT = _env_price_delta_pct()
+_ALERT_ON_AVAIL = _env_alert_on_avail()
+
+
+def reload_config() -> None:
+    """Re-read the module-level diff thresholds from the environment."""
+    global _PRICE_DELTA_PCT, _ALERT_ON_AVAIL
+    _PRICE_DELTA_PCT = _env_price_delta_pct()
+    _ALERT_ON_AVAIL = _env_alert_on_avail()
+
 
 def normalize_price(p: Optional[str]) -> Optional[str]:
     """Return a trimmed price string or None."""
@@ -15,6 +43,7 @@ def normalize_price(p: Optional[str]) -> Optional[str]:
     return p.strip()
 
 
+@lru_cache(maxsize=4096)
 def _parse_price_to_float(p: Optional[str]) -> Optional[float]:
     """Best-effort parse of a price string into a float.
 
@@ -24,12 +53,15 @@ def _parse_price_to_float(p: Optional[str]) -> Optional[float]:
       "1.234,56 €" -> 1234.56
       "$999"       -> 999.0
     Returns None if parsing fails or input is None/empty.
+
+    Memoized: the same price strings recur across snapshots of the same
+    products, so repeat calls skip the regex and float parse entirely.
     """
     if not p:
         return None
     s = p.strip()
     # Keep digits, dots, commas; drop currency symbols and other text
-    s = re.sub(r"[^0-9.,]", "", s)
+    s = _PRICE_RE.sub("", s)
     if not s:
         return None
 
@@ -65,42 +97,39 @@ def diff_product(prev: Product | None, curr: Product, price_delta_override: floa
     Returns (changed, summary). If `prev` is None (first snapshot), we report a
     short summary but do not treat it as a change.
     """
-    # Config from environment or overrides
-    if price_delta_override is not None:
-        price_delta_pct = price_delta_override
-    else:
-        try:
-            price_delta_pct = float(os.getenv("PRICE_DELTA_PCT", "0").strip() or "0")
-        except ValueError:
-            price_delta_pct = 0.0
-
-    if alert_avail_override is not None:
-        alert_on_avail = alert_avail_override
-    else:
-        alert_on_avail = (os.getenv("ALERT_ON_AVAILABILITY", "true").strip().lower() in TRUTHY)
+    # Config from module-level defaults (read once at import) or overrides
+    price_delta_pct = price_delta_override if price_delta_override is not None else _PRICE_DELTA_PCT
+    alert_on_avail = alert_avail_override if alert_avail_override is not None else _ALERT_ON_AVAIL
 
     if not prev:
         fields = ("price", "availability")
         summary = "Initial snapshot. " + ", ".join(f"{k}={curr.get(k) or ''}" for k in fields)
         return False, summary
 
+    # Fast path: most polls return byte-identical fields; skip all the
+    # normalization/parsing work when the raw strings already match.
+    if prev.get("price") == curr.get("price") and prev.get("availability") == curr.get("availability"):
+        return False, "No changes"
+
     changes = []
 
     # --- Price diff with threshold ---
-    prev_price_raw = normalize_price(prev.get("price"))
-    curr_price_raw = normalize_price(curr.get("price"))
-    pa = _parse_price_to_float(prev_price_raw)
-    pb = _parse_price_to_float(curr_price_raw)
-
+    pa = pb = None
+    prev_price_raw = curr_price_raw = None
     price_changed = False
-    if pa is None and pb is None:
-        price_changed = False
-    elif pa is None or pb is None:
-        # One side missing -> treat as change
-        price_changed = True
-        changes.append(f"price: {prev_price_raw or ''} → {curr_price_raw or ''}")
-    else:
-        if pa != pb:
+    if prev.get("price") != curr.get("price"):
+        prev_price_raw = normalize_price(prev.get("price"))
+        curr_price_raw = normalize_price(curr.get("price"))
+        pa = _parse_price_to_float(prev_price_raw)
+        pb = _parse_price_to_float(curr_price_raw)
+
+        if pa is None and pb is None:
+            price_changed = False
+        elif pa is None or pb is None:
+            # One side missing -> treat as change
+            price_changed = True
+            changes.append(f"price: {prev_price_raw or ''} → {curr_price_raw or ''}")
+        elif pa != pb:
             # Percentage relative to previous (avoid div by zero)
             if pa == 0:
                 pct = 100.0
@@ -116,7 +145,7 @@ def diff_product(prev: Product | None, curr: Product, price_delta_override: floa
                 pass
 
     # --- Availability diff (optional) ---
-    if alert_on_avail:
+    if alert_on_avail and prev.get("availability") != curr.get("availability"):
         prev_av = (prev.get("availability") or "").strip()
         curr_av = (curr.get("availability") or "").strip()
         if prev_av != curr_av:
@@ -128,3 +157,84 @@ def diff_product(prev: Product | None, curr: Product, price_delta_override: floa
         return False, "No changes"
 
     return True, "; ".join(changes)
+
+
+# --- Batch diff (vectorized) ---
+def diff_products_df(prev_df, curr_df, price_delta_override: float | None = None,
+                     alert_avail_override: bool | None = None):
+    """Vectorized batch counterpart of `diff_product` for DataFrame inputs.
+
+    Both frames need `source_url`, `price`, and `availability` columns; rows
+    are aligned on `source_url`. Price/threshold and availability semantics
+    match `diff_product`, but the comparisons run as pandas column ops
+    instead of a Python loop per product — use this when diffing a whole
+    run's snapshots at once. Per-row summaries are only built for the
+    (typically few) changed rows.
+
+    Returns a DataFrame indexed by source_url with `changed` (bool) and
+    `summary` (str) columns, one row per entry in `curr_df`.
+    """
+    import pandas as pd  # heavy import kept out of the CLI cold path
+
+    price_delta_pct = price_delta_override if price_delta_override is not None else _PRICE_DELTA_PCT
+    alert_on_avail = alert_avail_override if alert_avail_override is not None else _ALERT_ON_AVAIL
+
+    def _to_float(col: "pd.Series") -> "pd.Series":
+        # Mirrors _parse_price_to_float: strip junk, then treat the comma as
+        # thousands separator when a dot is present, decimal mark otherwise.
+        s = col.astype("string").str.replace(r"[^0-9.,]", "", regex=True)
+        has_comma = s.str.contains(",", regex=False).fillna(False)
+        has_dot = s.str.contains(".", regex=False).fillna(False)
+        s = s.mask(has_comma & has_dot, s.str.replace(",", "", regex=False))
+        s = s.mask(has_comma & ~has_dot, s.str.replace(",", ".", regex=False))
+        return pd.to_numeric(s, errors="coerce")
+
+    # Duplicate history rows for a URL: keep the last (most recent) one, so
+    # the reindex below never hits duplicate labels
+    prev_indexed = prev_df.drop_duplicates("source_url", keep="last").set_index("source_url")
+    curr = curr_df.set_index("source_url")
+    prev = prev_indexed.reindex(curr.index)
+    is_new = ~curr.index.isin(prev_indexed.index)
+
+    pa = _to_float(prev["price"])
+    pb = _to_float(curr["price"])
+    # Change away from a zero price counts as 100%, same as the scalar path
+    # (inf from the division would diverge for thresholds above 100)
+    pct = ((pb - pa).abs() / pa.abs() * 100.0).mask(pa == 0, 100.0)
+
+    price_changed = (
+        (pa.notna() != pb.notna())  # one side missing -> change
+        | (pa.notna() & pb.notna() & (pa != pb) & (pct + 1e-9 >= price_delta_pct))
+    )
+    avail_changed = pd.Series(False, index=curr.index)
+    if alert_on_avail:
+        prev_av = prev["availability"].fillna("").astype(str).str.strip()
+        curr_av = curr["availability"].fillna("").astype(str).str.strip()
+        avail_changed = prev_av != curr_av
+
+    changed = (price_changed | avail_changed) & ~is_new
+
+    def _row_dict(row: "pd.Series") -> dict:
+        # Missing strings surface from the frame as NaN floats — hand them
+        # to the scalar diff as None (NaN is truthy, so its `or ""` guards
+        # would pass the float through to .strip())
+        return {k: (None if pd.isna(v) else v) for k, v in row.items()}
+
+    # Summaries come from the scalar diff so wording stays identical; only
+    # the changed rows (typically a handful) pay the per-row cost.
+    summary = pd.Series("No changes", index=curr.index, dtype=object)
+    if is_new.any():
+        new_rows = curr.loc[is_new]
+        summary[is_new] = (
+            "Initial snapshot. price=" + new_rows["price"].fillna("").astype(str)
+            + ", availability=" + new_rows["availability"].fillna("").astype(str)
+        )
+    for url in curr.index[changed]:
+        summary[url] = diff_product(
+            _row_dict(prev_indexed.loc[url]),
+            _row_dict(curr.loc[url]),
+            price_delta_override=price_delta_pct,
+            alert_avail_override=alert_on_avail,
+        )[1]
+
+    return pd.DataFrame({"changed": changed, "summary": summary})
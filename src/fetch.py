@@ -1,11 +1,15 @@
 from __future__ import annotations
 import typing as t
+import os
+import threading
 import time
 import requests
 import random
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urlunparse
 
-from .config import USER_AGENT, REQUEST_TIMEOUT, RETRY_COUNT, RETRY_BACKOFF
+from . import jsonio
+from .config import CACHE_DIR, USER_AGENT, REQUEST_TIMEOUT, RETRY_COUNT, RETRY_BACKOFF
 from .log import get_logger
 
 log = get_logger("fetch")
@@ -18,6 +22,10 @@ _DEFAULT_HEADERS: Headers = {
     "User-Agent": USER_AGENT,
     "Accept-Language": "en-US,en;q=0.9",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    # Ask for brotli too (requests only advertises gzip/deflate by itself);
+    # product pages compress 6-10x, so this directly cuts transfer time.
+    # Decompression is handled transparently via the brotli package.
+    "Accept-Encoding": "gzip, deflate, br",
 }
 
 # Lightweight UA rotation (desktop + mobile) to reduce trivial blocks
@@ -31,6 +39,97 @@ _UA_POOL = [
     "Mozilla/5.0 (Linux; Android 14; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Mobile Safari/537.36",
 ]
 
+# Shared session so repeated fetches of the same host reuse keep-alive
+# connections instead of paying a fresh TCP+TLS handshake per request.
+# Retries stay in http_get's own loop (max_retries=0 on the adapter).
+# Note: not fork-safe; recreate after os.fork() if workers are ever added.
+_SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+# Conditional-request cache: url -> (etag, last_modified). Most polls of a
+# product URL return the same HTML; when the server honors validators we get
+# a body-less 304 back and skip the transfer entirely. Persisted to a JSON
+# sidecar so scheduled runs keep benefiting across process restarts.
+_COND_CACHE_PATH = os.path.join(CACHE_DIR, "etags.json")
+# run_list workers share this cache — see _save_cond_cache
+_cond_cache_lock = threading.Lock()
+_cond_cache: t.Dict[str, t.Tuple[t.Optional[str], t.Optional[str]]] = {}
+try:
+    with open(_COND_CACHE_PATH, "rb") as _f:
+        _cond_cache = {u: (v[0], v[1]) for u, v in jsonio.loads(_f.read()).items()}
+except Exception:
+    pass
+
+
+def _save_cond_cache() -> None:
+    """Best-effort persist of the validator cache (atomic replace).
+
+    Caller must hold _cond_cache_lock: serializing while another worker
+    mutates the dict raises mid-dump, and two flushes sharing the fixed
+    .tmp name could install a corrupt file.
+    """
+    try:
+        os.makedirs(os.path.dirname(_COND_CACHE_PATH), exist_ok=True)
+        tmp = _COND_CACHE_PATH + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(jsonio.dumps({u: list(v) for u, v in _cond_cache.items()}))
+        os.replace(tmp, _COND_CACHE_PATH)
+    except Exception as e:
+        log.debug("Validator cache write failed: %r", e)
+
+# Optional HTTP/2 client: many requests to one host (Amazon/eBay) share a
+# single TLS session with stream multiplexing instead of N pooled sockets.
+# httpx.Response exposes the same attributes callers use (.status_code,
+# .text, .content, .headers, settable .encoding), so no adapter is needed.
+# Falls back cleanly when httpx or the h2 extra is missing.
+try:
+    import httpx
+
+    _HTTPX_CLIENT: t.Optional["httpx.Client"] = httpx.Client(
+        http2=True,
+        timeout=REQUEST_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+except Exception:
+    _HTTPX_CLIENT = None
+
+
+def _do_get(url: str, hdrs: Headers, proxies: t.Optional[t.Dict[str, str]]):
+    """Issue one GET via the HTTP/2 client when possible, else the session.
+
+    Per-URL proxies can't be set on a shared httpx client, so proxied
+    requests always go through the requests session.
+    """
+    if _HTTPX_CLIENT is not None and proxies is None:
+        return _HTTPX_CLIENT.get(url, headers=hdrs)
+    return _SESSION.get(url, headers=hdrs, timeout=REQUEST_TIMEOUT, proxies=proxies)
+
+
+def _fix_encoding(resp: requests.Response) -> None:
+    """Correct a missing or placeholder charset on the response.
+
+    Some servers send no charset or default to ISO-8859-1, which yields
+    artifacts like "Â£" when decoding. Unlike `resp.apparent_encoding`,
+    which runs the detector over the entire body, this sniffs only the
+    first 2 KB — charset is effectively always decidable from the head of
+    an HTML document, and large pages stay O(2KB) instead of O(size).
+    """
+    enc = (resp.encoding or "").lower()
+    if enc and enc not in ("iso-8859-1", "latin-1", "us-ascii"):
+        return
+    try:
+        from charset_normalizer import from_bytes
+
+        best = from_bytes(resp.content[:2048]).best()
+        if best and best.encoding:
+            log.debug("Adjusting encoding: %s -> %s", enc or "None", best.encoding)
+            resp.encoding = best.encoding
+    except Exception:
+        pass
+
 
 def http_get(url: str, headers: t.Optional[Headers] = None, user_agent_override: str | None = None, proxy: str | None = None) -> requests.Response:
     """
@@ -44,43 +143,43 @@ def http_get(url: str, headers: t.Optional[Headers] = None, user_agent_override:
         h["User-Agent"] = user_agent_override
     if headers:
         h.update(headers)
+    h.setdefault("Referer", "https://www.google.com/")
+
+    # Conditional GET: replay validators from the last 200 for this URL.
+    # Callers must treat a 304 response as "unchanged since last fetch".
+    etag, last_modified = _cond_cache.get(url, (None, None))
+    if etag:
+        h.setdefault("If-None-Match", etag)
+    if last_modified:
+        h.setdefault("If-Modified-Since", last_modified)
+
+    proxies = None
+    if proxy:
+        proxies = {"http": proxy, "https": proxy}
+
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except Exception:
+        host = ""
+    is_ebay = "ebay." in host
 
     last_err: Exception | None = None
     for attempt in range(1, RETRY_COUNT + 1):
         try:
-            log.info(f"GET {url} (attempt {attempt}/{RETRY_COUNT})")
-            # Rotate UA per attempt and add a generic referer
+            log.info("GET %s (attempt %d/%d)", url, attempt, RETRY_COUNT)
+            # Rotate UA per attempt to reduce trivial blocks on retries
             if not user_agent_override:
                 h["User-Agent"] = random.choice(_UA_POOL)
-            h.setdefault("Referer", "https://www.google.com/")
-            proxies = None
-            if proxy:
-                proxies = {"http": proxy, "https": proxy}
-            resp = requests.get(url, headers=h, timeout=REQUEST_TIMEOUT, proxies=proxies)
-            # Encoding correction: some servers send wrong or missing charset
-            # (e.g., defaulting to ISO-8859-1) which yields artifacts like "Â£".
-            # Prefer apparent_encoding when the declared encoding is missing or
-            # a common placeholder.
-            enc = (resp.encoding or "").lower()
-            if not enc or enc in ("iso-8859-1", "latin-1", "us-ascii"):
-                try:
-                    apparent = resp.apparent_encoding
-                    if apparent:
-                        log.debug(f"Adjusting encoding: {enc or 'None'} -> {apparent}")
-                        resp.encoding = apparent
-                except Exception:
-                    pass
+            resp = _do_get(url, h, proxies)
+            _fix_encoding(resp)
             # Treat server errors and common anti-bot statuses as transient
             if resp.status_code in (403, 429):
                 raise requests.HTTPError(f"Transient block {resp.status_code}")
             if 500 <= resp.status_code < 600:
                 raise requests.HTTPError(f"Server error {resp.status_code}")
-            # eBay anti-bot interstitial fallback: try mobile host if detected
-            try:
-                host = (urlparse(url).hostname or "").lower()
-            except Exception:
-                host = ""
-            if "ebay." in host and resp.status_code == 200 and "Pardon Our Interruption" in resp.text:
+            # eBay anti-bot interstitial fallback: try mobile host if detected.
+            # Check bytes so non-matching responses never force a full decode.
+            if is_ebay and resp.status_code == 200 and b"Pardon Our Interruption" in resp.content:
                 log.info("Detected eBay interstitial; retrying via m.* host")
                 u = urlparse(url)
                 mobile_host = u.hostname or ""
@@ -92,25 +191,47 @@ def http_get(url: str, headers: t.Optional[Headers] = None, user_agent_override:
                 h_mobile = dict(h)
                 if not user_agent_override:
                     h_mobile["User-Agent"] = random.choice(_UA_POOL)
-                resp = requests.get(m_url, headers=h_mobile, timeout=REQUEST_TIMEOUT, proxies=proxies)
-                # Re-apply encoding fix
-                enc2 = (resp.encoding or "").lower()
-                if not enc2 or enc2 in ("iso-8859-1", "latin-1", "us-ascii"):
-                    try:
-                        apparent2 = resp.apparent_encoding
-                        if apparent2:
-                            log.debug(f"Adjusting encoding (mobile): {enc2 or 'None'} -> {apparent2}")
-                            resp.encoding = apparent2
-                    except Exception:
-                        pass
+                resp = _do_get(m_url, h_mobile, proxies)
+                _fix_encoding(resp)
+            if resp.status_code == 200:
+                new_etag = resp.headers.get("ETag")
+                new_lm = resp.headers.get("Last-Modified")
+                if new_etag or new_lm:
+                    with _cond_cache_lock:
+                        if _cond_cache.get(url) != (new_etag, new_lm):
+                            _cond_cache[url] = (new_etag, new_lm)
+                            _save_cond_cache()
             return resp
         except Exception as e:
             last_err = e
             if attempt == RETRY_COUNT:
                 break
             sleep_s = RETRY_BACKOFF * (2 ** (attempt - 1))
-            log.warning(f"Request failed: {e!r}. Retry in {sleep_s:.2f}s")
+            log.warning("Request failed: %r. Retry in %.2fs", e, sleep_s)
             time.sleep(sleep_s)
 
     assert last_err is not None
     raise last_err
+
+
+def http_get_many(urls: t.List[str], concurrency: int = 8) -> t.List[t.Union[requests.Response, Exception]]:
+    """Fetch several URLs concurrently through the shared session.
+
+    Each URL keeps the full `http_get` retry/backoff semantics; fetches just
+    overlap on a thread pool since wall time is dominated by network latency.
+    Returns results in input order; a URL whose retries are exhausted yields
+    its final exception instead of a Response so one bad URL can't sink the
+    whole batch. `concurrency` is capped at the session's pool size (32).
+    """
+    if not urls:
+        return []
+    workers = max(1, min(concurrency, 32, len(urls)))
+
+    def _fetch(u: str) -> t.Union[requests.Response, Exception]:
+        try:
+            return http_get(u)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+        return list(pool.map(_fetch, urls))
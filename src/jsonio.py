@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+# orjson decodes and encodes several times faster than stdlib json. The
+# sidecar caches under .cache/ are rewritten on every change, so the win
+# lands on the hot path; falls back silently when orjson isn't installed
+# (same pattern as the Telegram payload encoding in alerts.py).
+try:
+    import orjson
+
+    def loads(data: bytes | str):
+        return orjson.loads(data)
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except Exception:  # pragma: no cover - depends on environment
+    import json
+
+    def loads(data: bytes | str):
+        return json.loads(data)
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
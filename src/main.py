@@ -1,30 +1,147 @@
 from __future__ import annotations
 import argparse
+import hashlib
+import importlib
+import re
+import threading
 import time
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from urllib.parse import urlparse
 import os
 
+from . import config
+from . import jsonio
+from .config import _env_bool
 from .log import setup_logging, get_logger
-from .fetch import http_get
-from .parse.generic import extract_title
-from .parse.amazon import parse_product as parse_amazon
-from .parse.books_toscrape import parse_product as parse_books
-from .parse.ebay import parse_product as parse_ebay
-from . import sheets
-from .sheets import append_log
-from .diff import diff_product
-from .alerts import send_telegram_message, send_email_alert
-from . import scheduler as schedmod
+
+# The heavy dependencies (lxml, gspread, pandas, APScheduler, smtplib)
+# import inside the cmd_* functions that need them: --help, export_csv and
+# digest shouldn't pay the parser/scheduler import cost at startup.
 
 log = get_logger("main")
 
+# Everything from the first '?' or '#' onwards; used to normalize URLs in
+# the digest (drop query + fragment, keep scheme/netloc/path).
+_STRIP_QS = re.compile(r"[?#].*\Z", re.DOTALL)
+
+# Host-substring → (parse module, label, generic-title fallback). Scanned
+# once per fetch instead of re-running the if/elif substring chain inline;
+# the modules themselves import on first use via _parser_for.
+_ROUTES = (
+    ("books.toscrape.com", "books_toscrape", "BooksToScrape", False),
+    ("amazon.", "amazon", "Amazon", True),
+    ("ebay.", "ebay", "eBay", True),
+)
+
+
+@lru_cache(maxsize=None)
+def _parser_for(module_name: str):
+    """parse_product from src.parse.<module_name>, imported on first use."""
+    return importlib.import_module(f".parse.{module_name}", __package__).parse_product
+
+
+@lru_cache(maxsize=256)
+def _host_of(url: str) -> str:
+    """Lowercased hostname of `url`; cached since tracked URLs repeat."""
+    return (urlparse(url).hostname or "").lower()
+
+
+@lru_cache(maxsize=1024)
+def _route_for(url: str) -> tuple | None:
+    """_ROUTES entry matching `url`'s host, or None.
+
+    Cached: scheduled runs hit the same URLs over and over, so repeats skip
+    both the urlparse and the route scan.
+    """
+    host = _host_of(url)
+    return next((r for r in _ROUTES if r[0] in host), None)
+
+
+def _parse_dispatch(url: str, html: str) -> tuple:
+    """Route `html` to the parser registered for `url`'s host.
+
+    Top-level (picklable) so it can run in the parser process pool.
+    Returns (product, label) where label names the parser used.
+    """
+    from .parse.generic import extract_title
+    from .product import Product
+
+    route = _route_for(url)
+    if route:
+        _, module_name, label, title_fallback = route
+        product = _parser_for(module_name)(html)
+        if title_fallback:
+            # Fallback title via generic parser
+            product.title = product.title or (extract_title(html) or "<no title>")
+        return product, label
+    # Fallback: only title
+    return Product(title=extract_title(html) or "<no title>"), "Generic"
+
+
+# With PARSE_PROCESSES > 0, parsing is dispatched to a process pool so
+# concurrent run_list workers use separate cores instead of serializing on
+# the GIL. Off by default: the lxml parsers are cheap per page, and pickling
+# megabyte HTML bodies across the process boundary only pays off for large
+# pages on long URL lists.
+_PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", "0"))
+_PARSE_POOL = ProcessPoolExecutor(max_workers=_PARSE_PROCESSES) if _PARSE_PROCESSES > 0 else None
+
+
+# --- Parse cache -------------------------------------------------------------
+# Scheduled polls usually get back byte-identical HTML. Remember the body
+# hash and parsed fields per URL (persisted to a sidecar JSON so the cache
+# survives restarts); on a hash match the parse and the Sheets diff lookup
+# are skipped entirely.
+
+_PARSE_CACHE_PATH = os.path.join(config.CACHE_DIR, "parse_cache.json")
+# run_list workers share this cache; the lock keeps one flush from
+# serializing the dict while another mutates it (and the .tmp sidecar
+# from being written by two threads at once)
+_parse_cache_lock = threading.Lock()
+_parse_cache: dict | None = None
+
+
+def _load_parse_cache() -> dict:
+    global _parse_cache
+    if _parse_cache is None:
+        try:
+            with open(_PARSE_CACHE_PATH, "rb") as f:
+                _parse_cache = jsonio.loads(f.read())
+        except Exception:
+            _parse_cache = {}
+    return _parse_cache
+
+
+def _store_parse_cache(url: str, content_hash: str, data: dict) -> None:
+    with _parse_cache_lock:
+        cache = _load_parse_cache()
+        cache[url] = {"hash": content_hash, "data": data}
+        try:
+            os.makedirs(os.path.dirname(_PARSE_CACHE_PATH), exist_ok=True)
+            tmp = _PARSE_CACHE_PATH + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(jsonio.dumps(cache))
+            os.replace(tmp, _PARSE_CACHE_PATH)
+        except Exception as e:
+            log.debug("Parse cache write failed: %r", e)
+
 
-def _env_bool(name: str, default: bool = False) -> bool:
-    val = os.getenv(name)
-    if val is None:
-        return default
-    return val.strip().lower() in ("1", "true", "yes", "y")
+# Anti-bot interstitials and empty bodies carry none of the product fields,
+# so parsing them is wasted tree construction. Checked on raw bytes (head
+# only) so a blocked page never pays for a full decode.
+_BLOCK_MARKERS = (
+    b"Pardon Our Interruption",  # eBay interstitial (mobile retry failed too)
+    b"Enter the characters you see below",  # Amazon robot check
+    b"/captcha/",
+)
+
+
+def _looks_blocked(content: bytes) -> bool:
+    if not content.strip():
+        return True
+    head = content[:8192]
+    return any(m in head for m in _BLOCK_MARKERS)
 
 
 def _time_to_cron(time_str: str) -> str:
@@ -43,53 +160,91 @@ def cmd_run_once(url: str, write_to_sheet: bool, notify_telegram: bool, notify_a
                  notify_email: bool = False, user_agent_override: str | None = None,
                  write_on_change_only: bool = False, proxy: str | None = None) -> int:
     """Fetch the URL once, parse key fields, optionally write to Google Sheets and notify."""
+    from . import sheets
+    from . import snapshot_cache
+    from .alerts import send_telegram_message, send_email_alert
+    from .diff import diff_product
+    from .fetch import http_get
+    from .sheets import append_log
+
     resp = http_get(url, user_agent_override=user_agent_override, proxy=proxy)
-    html = resp.text
     status = resp.status_code
-    log.info(f"Status: {status}")
-
-    host = (urlparse(url).hostname or "").lower()
-
-    if "books.toscrape.com" in host:
-        data = parse_books(html)
-        log.info("Parsed (BooksToScrape):")
-    elif "amazon." in host:
-        data = parse_amazon(html)
-        # Fallback title via generic parser
-        data["title"] = data.get("title") or (extract_title(html) or "<no title>")
-        log.info("Parsed (Amazon):")
-    elif "ebay." in host:
-        data = parse_ebay(html)
-        data["title"] = data.get("title") or (extract_title(html) or "<no title>")
-        log.info("Parsed (eBay):")
+    log.info("Status: %s", status)
+
+    if status == 304:
+        # Server confirmed the page is unchanged since the last fetch
+        # (conditional GET) — nothing to parse, diff, write, or alert on.
+        log.info("Not modified (304); skipping parse/diff")
+        try:
+            append_log(
+                url=url,
+                status="304",
+                title="(not modified)",
+                summary="No changes (304 Not Modified)",
+                wrote=False,
+                alerted=False,
+            )
+        except Exception as e:
+            log.warning("append_log failed: %r", e)
+        return 0
+
+    if _looks_blocked(resp.content):
+        # Captcha/interstitial or empty body: no product fields to find, so
+        # skip the parse (and keep the junk body out of the parse cache).
+        log.warning("Page looks blocked or empty; skipping parse")
+        try:
+            append_log(
+                url=url,
+                status=str(status),
+                title="(blocked)",
+                summary="Skipped parse (blocked or empty page)",
+                wrote=False,
+                alerted=False,
+            )
+        except Exception as e:
+            log.warning("append_log failed: %r", e)
+        return 0
+
+    content_hash = hashlib.blake2b(resp.content, digest_size=16).hexdigest()
+    cached = _load_parse_cache().get(url)
+    if cached and cached.get("hash") == content_hash:
+        # Identical body to the last poll: reuse the parsed fields and skip
+        # both the HTML parse and the Sheets diff lookup.
+        log.info("Body hash unchanged; reusing cached parse")
+        data = dict(cached["data"])
+        changed, summary = False, "No changes (content unchanged)"
     else:
-        # Fallback: only title
-        data = {
-            "title": extract_title(html) or "<no title>",
-            "price": None,
-            "availability": None,
-            "asin": None,
-            "sku": None,
-        }
-        log.info("Parsed (Generic):")
-
-    for k, v in data.items():
-        log.info(f"  {k}: {v}")
-
-    # Add source_url for traceability before writing
-    data["source_url"] = url
-
-    # Compare with previous snapshot from the sheet (if any)
-    prev = sheets.get_last_row_by_url(url)
-    changed, summary = diff_product(prev, data, price_delta_override=price_delta_pct,
-                                    alert_avail_override=alert_on_availability)
-    log.info(f"Diff: {summary}")
+        html = resp.text
+
+        if _PARSE_POOL is not None:
+            product, label = _PARSE_POOL.submit(_parse_dispatch, url, html).result()
+        else:
+            product, label = _parse_dispatch(url, html)
+        log.info("Parsed (%s):", label)
+
+        # Add source_url for traceability, then drop to a plain dict for the
+        # cache/diff/sheet boundaries
+        product.source_url = url
+        data = product.to_dict()
+
+        for k, v in data.items():
+            log.info("  %s: %s", k, v)
+
+        _store_parse_cache(url, content_hash, data)
+
+        # Compare with the previous snapshot: local mirror first, the sheet
+        # only on a cache miss (first run for a URL or a cleared .cache/)
+        prev = snapshot_cache.get_last(url) or sheets.get_last_row_by_url(url)
+        changed, summary = diff_product(prev, data, price_delta_override=price_delta_pct,
+                                        alert_avail_override=alert_on_availability)
+    log.info("Diff: %s", summary)
 
     if write_to_sheet:
-        write_on_change_only_env = os.getenv("WRITE_ON_CHANGE_ONLY", "").strip().lower() in ("1", "true", "yes", "y")
+        write_on_change_only_env = config.CFG.write_on_change_only
         write_on_change_only_final = write_on_change_only or write_on_change_only_env
         if not (write_on_change_only_final and not changed):
             sheets.write_product_row(data)
+            snapshot_cache.set_last(url, data)
         else:
             log.info("Skipped writing row (WRITE_ON_CHANGE_ONLY enabled and no change detected)")
 
@@ -99,7 +254,7 @@ def cmd_run_once(url: str, write_to_sheet: bool, notify_telegram: bool, notify_a
         msg = f"{prefix} {title}\n{summary}\n{url}"
         send_telegram_message(msg)
 
-    if notify_email or os.getenv("NOTIFY_EMAIL", "").strip().lower() in ("1", "true", "yes", "y"):
+    if notify_email or config.CFG.notify_email:
         subject = f"[Tracker] {'Change' if changed else 'Snapshot'}: {data.get('title') or '<no title>'}"
         body = f"{summary}\n{url}"
         send_email_alert(subject, body)
@@ -123,6 +278,8 @@ def cmd_run_once(url: str, write_to_sheet: bool, notify_telegram: bool, notify_a
 
 def _job_run_once(url: str, write_to_sheet: bool, notify_telegram: bool) -> None:
     """Wrapper to run a single cycle from the scheduler context."""
+    from .sheets import append_log
+
     try:
         cmd_run_once(url, write_to_sheet, notify_telegram)
     except Exception as e:
@@ -143,20 +300,18 @@ def _job_run_once(url: str, write_to_sheet: bool, notify_telegram: bool) -> None
 
 # Run over a list of URLs from the Inputs sheet
 
-def cmd_run_list(write_to_sheet: bool, notify_telegram: bool, sleep_seconds: float) -> int:
-    from .sheets import get_input_urls
+def cmd_run_list(write_to_sheet: bool, notify_telegram: bool, sleep_seconds: float,
+                 concurrency: int = 1) -> int:
+    from . import sheets
+    from .sheets import append_log, get_input_urls
 
     urls = get_input_urls()
     if not urls:
         log.info("No URLs found in Inputs sheet. Add rows with a 'url' column.")
         return 0
 
-    log.info("Processing %d URL(s) from Inputs sheet...", len(urls))
-    for i, cfg in enumerate(urls, 1):
+    def _process(i: int, cfg: dict) -> None:
         url = cfg["url"]
-        if not cfg.get("enabled", True):
-            log.info("[%d/%d] %s (disabled)", i, len(urls), url)
-            continue
         log.info("[%d/%d] %s", i, len(urls), url)
         try:
             cmd_run_once(
@@ -182,15 +337,51 @@ def cmd_run_list(write_to_sheet: bool, notify_telegram: bool, sleep_seconds: flo
                 )
             except Exception:
                 pass
-        effective_sleep = cfg.get("delay_seconds") or sleep_seconds
-        time.sleep(max(0.0, effective_sleep))
-    return 0
+
+    log.info("Processing %d URL(s) from Inputs sheet...", len(urls))
+    # Buffer Sheets writes for the whole run: rows collect in memory and go
+    # out in append_rows batches instead of one API round-trip per URL.
+    sheets.begin_batch()
+    try:
+        if concurrency > 1:
+            # The fetch+parse path is network-dominated: overlap URLs on a
+            # bounded pool, sleeping the full per-URL delay between
+            # submissions. The request rate stays at the sequential pace
+            # (including any delay_seconds politeness knob from the Inputs
+            # sheet); the win is that slow responses overlap instead of
+            # serializing, so the run finishes in submit-time rather than
+            # submit-time plus the sum of the response tails.
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="run_list") as pool:
+                futures = []
+                for i, cfg in enumerate(urls, 1):
+                    if not cfg.get("enabled", True):
+                        log.info("[%d/%d] %s (disabled)", i, len(urls), cfg["url"])
+                        continue
+                    futures.append(pool.submit(_process, i, cfg))
+                    effective_sleep = cfg.get("delay_seconds") or sleep_seconds
+                    time.sleep(max(0.0, effective_sleep))
+                for f in futures:
+                    f.result()
+            return 0
+
+        for i, cfg in enumerate(urls, 1):
+            if not cfg.get("enabled", True):
+                log.info("[%d/%d] %s (disabled)", i, len(urls), cfg["url"])
+                continue
+            _process(i, cfg)
+            effective_sleep = cfg.get("delay_seconds") or sleep_seconds
+            time.sleep(max(0.0, effective_sleep))
+        return 0
+    finally:
+        sheets.flush_batch()
 
 
 def cmd_digest(notify_telegram: bool, notify_email: bool, hours: int = 24) -> int:
     """Generate a clean digest of meaningful changes from Logs for the past N hours."""
-    from datetime import datetime, timedelta
-    from urllib.parse import urlsplit, urlunsplit
+    import pandas as pd
+    from .alerts import send_telegram_message, send_email_alert
     from .sheets import _get_client
 
     sheet_id = os.getenv("GOOGLE_SHEET_ID")
@@ -207,71 +398,65 @@ def cmd_digest(notify_telegram: bool, notify_email: bool, hours: int = 24) -> in
         log.warning("Logs worksheet '%s' not found: %r", log_sheet, e)
         return 1
 
-    values = ws.get_all_values()
+    # The digest only reads timestamp/url/title/summary, which live in the
+    # first five Logs columns — fetch just that range instead of every cell.
+    try:
+        values = ws.get("A1:E")
+    except Exception:
+        values = ws.get_all_values()
     if not values or len(values) < 2:
         log.info("No logs found to build digest.")
         return 0
 
     header = [h.strip().lower() for h in values[0]]
-    try:
-        ts_idx = header.index("timestamp")
-        sum_idx = header.index("summary")
-        url_idx = header.index("url")
-        title_idx = header.index("title")
-    except ValueError:
+    if not {"timestamp", "summary", "url", "title"}.issubset(header):
         log.warning("Logs sheet header is missing required columns")
         return 1
 
-    cutoff = datetime.utcnow() - timedelta(hours=hours)
-
-    def _normalize_url(u: str) -> str:
-        if not u:
-            return u
-        p = urlsplit(u)
-        # strip query & fragment to merge tracking variants
-        return urlunsplit((p.scheme, p.netloc, p.path, "", ""))
-
-    # Keep the most recent meaningful entry per normalized URL
-    by_url = {}  # norm_url -> (ts, title, summary, shown_url)
-    for row in values[1:]:
-        if ts_idx >= len(row) or sum_idx >= len(row) or url_idx >= len(row):
-            continue
-        ts_str = row[ts_idx]
-        try:
-            ts = datetime.fromisoformat(ts_str.replace("Z", ""))
-        except Exception:
-            continue
-        if ts < cutoff:
-            continue
-
-        summary = (row[sum_idx] or "").strip()
-        if not summary:
-            continue
-        low = summary.lower()
+    # Vectorized filter + dedup: C-level timestamp parsing and string ops
+    # instead of a Python loop over every log row.
+    width = len(header)
+    rows = [r + [""] * (width - len(r)) if len(r) < width else r[:width] for r in values[1:]]
+    df = pd.DataFrame(rows, columns=header)
+
+    ts = pd.to_datetime(df["timestamp"], format="ISO8601", errors="coerce", utc=True)
+    summary = df["summary"].fillna("").str.strip()
+    low = summary.str.lower()
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=hours)
+    keep = (
+        ts.notna()
+        & (ts >= cutoff)
+        & (summary != "")
         # Filter out noise
-        if low.startswith("no changes") or low.startswith("initial snapshot"):
-            continue
-
-        url = (row[url_idx] or "").strip()
-        title = ((row[title_idx] if title_idx < len(row) else "") or "").strip() or "<no title>"
-
-        norm = _normalize_url(url)
-        prev = by_url.get(norm)
-        if (not prev) or (ts > prev[0]):
-            by_url[norm] = (ts, title, summary, norm)
+        & ~low.str.startswith("no changes")
+        & ~low.str.startswith("initial snapshot")
+    )
+    df = df.loc[keep].assign(ts=ts[keep], summary=summary[keep])
 
-    if not by_url:
+    if df.empty:
         log.info("No meaningful changes in last %d hours", hours)
         return 0
 
-    # Sort by time (desc) and render
-    items = sorted(by_url.values(), key=lambda x: x[0], reverse=True)
-    lines = [f"• {title} — {summary}\n  {url}" for (_, title, summary, url) in items]
+    # Strip query & fragment to merge tracking variants: one C-level regex
+    # pass instead of urlsplit/urlunsplit tuple juggling per URL.
+    df["norm_url"] = df["url"].fillna("").str.strip().str.replace(_STRIP_QS, "", regex=True)
+    df["title"] = df["title"].fillna("").str.strip().replace("", "<no title>")
+
+    # Keep the most recent meaningful entry per normalized URL, newest
+    # first. idxmax dedups in one O(N) pass (no presort needed) and
+    # nlargest orders + bounds the digest to 200 entries in O(N log k)
+    # instead of a full O(N log N) sort.
+    latest = df.loc[df.groupby("norm_url", sort=False)["ts"].idxmax()]
+    latest = latest.nlargest(200, "ts")
+    lines = [
+        f"• {title} — {summary}\n  {url}"
+        for title, summary, url in zip(latest["title"], latest["summary"], latest["norm_url"])
+    ]
     body = "Digest of changes in last %d hours:\n%s" % (hours, "\n".join(lines))
 
     if notify_telegram:
         send_telegram_message(body)
-    if notify_email or os.getenv("NOTIFY_EMAIL", "").strip().lower() in ("1", "true", "yes", "y"):
+    if notify_email or config.CFG.notify_email:
         send_email_alert("[Tracker] Daily Digest", body)
     return 0
 
@@ -332,6 +517,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=2.0,
         help="Delay between URLs (default: 2.0)",
     )
+    p_list.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("RUN_LIST_CONCURRENCY", "1")),
+        help="Process up to N URLs in parallel (env RUN_LIST_CONCURRENCY; default: 1, sequential)",
+    )
 
     # schedule
     p_sched = sub.add_parser("schedule", help="Run scheduler")
@@ -371,7 +562,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_digest.add_argument(
         "--hours",
         type=int,
-        default=int(os.getenv("DIGEST_HOURS_DEFAULT", os.getenv("DIGEST_HOURS", "24"))),
+        default=int(os.getenv("DIGEST_HOURS_DEFAULT", str(config.CFG.digest_hours))),
         help="Look back this many hours (env DIGEST_HOURS_DEFAULT or DIGEST_HOURS; default: 24)",
     )
 
@@ -388,7 +579,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_sdd.add_argument(
         "--hours",
         type=int,
-        default=int(os.getenv("DIGEST_HOURS_DEFAULT", os.getenv("DIGEST_HOURS", "24"))),
+        default=int(os.getenv("DIGEST_HOURS_DEFAULT", str(config.CFG.digest_hours))),
         help="Lookback window in hours for the digest (env DIGEST_HOURS_DEFAULT or DIGEST_HOURS)",
     )
     p_sdd.add_argument(
@@ -447,9 +638,12 @@ def main() -> int:
         )
 
     elif args.command == "run_list":
-        return cmd_run_list(args.write_to_sheet, args.notify_telegram, args.sleep_seconds)
+        return cmd_run_list(args.write_to_sheet, args.notify_telegram, args.sleep_seconds,
+                            concurrency=getattr(args, "concurrency", 1))
 
     elif args.command == "schedule":
+        from . import scheduler as schedmod
+
         job = partial(_job_run_once, args.url, args.write_to_sheet, args.notify_telegram)
 
         def add_jobs(s):
@@ -466,6 +660,8 @@ def main() -> int:
         return cmd_digest(args.notify_telegram, getattr(args, "notify_email", False), getattr(args, "hours", 24))
 
     elif args.command == "schedule_daily_digest":
+        from . import scheduler as schedmod
+
         # Build a job that runs the digest with configured flags
         job = lambda: cmd_digest(
             notify_telegram=getattr(args, "notify_telegram", True),
@@ -481,6 +677,8 @@ def main() -> int:
         return 0
 
     elif args.command == "export_csv":
+        from . import sheets
+
         return sheets.export_sheet_to_csv(
             sheet_name=args.sheet,
             out_path=args.out,
@@ -1,68 +1,87 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup
-import typing as t
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
 
+from ..product import Product
 
-def _text(el) -> str | None:
-    if not el:
-        return None
-    return el.get_text(strip=True)
-
-
-def parse_product(html: str) -> t.Dict[str, t.Optional[str]]:
-    soup = BeautifulSoup(html, "lxml")
-
-    title = _text(soup.select_one("#productTitle")) or _text(soup.select_one("span#title"))
-
-    price = None
-    candidates = [
+# Selectors compiled once at import: CSS→XPath translation and XPath
+# compilation are repeated per page otherwise, which adds up when
+# run_list iterates many URLs.
+_TITLE_SELS = [CSSSelector(s) for s in ("#productTitle", "span#title")]
+_PRICE_SELS = [
+    CSSSelector(s)
+    for s in (
         "#corePrice_desktop .a-offscreen",
         "#corePrice_feature_div .a-offscreen",
         "#apex_desktop .a-offscreen",
         ".a-price .a-offscreen",
-    ]
-    for sel in candidates:
-        el = soup.select_one(sel)
-        if el:
-            price = _text(el)
-            if price:
-                break
-
-    availability = None
-    avail_candidates = [
+    )
+]
+_AVAIL_SELS = [
+    CSSSelector(s)
+    for s in (
         "#availability .a-color-success",
         "#availability .a-color-state",
         "#availability span",
-    ]
-    for sel in avail_candidates:
-        el = soup.select_one(sel)
-        if el:
-            availability = _text(el)
-            if availability:
-                break
+    )
+]
+_ASIN_SEL = CSSSelector("input#ASIN")
+_BODY_SEL = CSSSelector("body")
+# One compiled XPath replaces the old per-<th> Python-callable scan: the
+# substring matches run inside libxml2, so cost no longer scales with
+# Python-call overhead per table header.
+_SKU_XPATH = etree.XPath(
+    "//th[contains(., 'Item model number') or contains(., 'Model Number')"
+    " or contains(., 'SKU')]/following-sibling::td[1]"
+)
+
+
+def _text(el) -> str | None:
+    if el is None:
+        return None
+    # Collapse internal whitespace: text_content() keeps the raw newlines
+    # and indentation between child nodes
+    txt = " ".join(el.text_content().split())
+    return txt or None
+
+
+def _first_text(tree, selectors) -> str | None:
+    for sel in selectors:
+        els = sel(tree)
+        if els:
+            txt = _text(els[0])
+            if txt:
+                return txt
+    return None
+
+
+def parse_product(html: str) -> Product:
+    # lxml.html directly: skips BeautifulSoup's Python wrapper layer over
+    # libxml2, which dominated per-page parse CPU.
+    tree = lxml_html.fromstring(html)
+
+    title = _first_text(tree, _TITLE_SELS)
+    price = _first_text(tree, _PRICE_SELS)
+    availability = _first_text(tree, _AVAIL_SELS)
 
     asin = None
-    asin_input = soup.select_one('input#ASIN')
-    if asin_input and asin_input.has_attr('value'):
-        asin = asin_input['value']
+    asin_inputs = _ASIN_SEL(tree)
+    if asin_inputs:
+        asin = asin_inputs[0].get("value") or None
     if not asin:
-        body = soup.select_one("body")
-        if body and body.has_attr("data-asin"):
-            asin = body["data-asin"]
+        bodies = _BODY_SEL(tree)
+        if bodies:
+            asin = bodies[0].get("data-asin") or None
 
     sku = None
-    for th_text in ["Item model number", "Model Number", "SKU"]:
-        th = soup.find("th", string=lambda s: isinstance(s, str) and th_text in s)
-        if th:
-            td = th.find_next("td")
-            sku = _text(td)
-            if sku:
-                break
+    tds = _SKU_XPATH(tree)
+    if tds:
+        sku = _text(tds[0])
 
-    return {
-        "title": title,
-        "price": price,
-        "availability": availability,
-        "asin": asin,
-        "sku": sku,
-    }
+    return Product(
+        title=title,
+        price=price,
+        availability=availability,
+        asin=asin,
+        sku=sku,
+    )
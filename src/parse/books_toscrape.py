@@ -1,29 +1,34 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup
-import typing as t
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
 
+from ..product import Product
 
-def parse_product(html: str) -> t.Dict[str, t.Optional[str]]:
+# Compiled once at import; see amazon.py for rationale
+_TITLE_SEL = CSSSelector(".product_main h1")
+_PRICE_SEL = CSSSelector(".product_main .price_color")
+_AVAIL_SEL = CSSSelector(".product_main .availability")
+
+
+def parse_product(html: str) -> Product:
     """Parse a Books to Scrape product page (stable training site).
 
-    Returns a dict with keys: title, price, availability, asin, sku.
     ASIN/SKU are not present on this site, so they remain None.
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    title_el = soup.select_one(".product_main h1")
-    title = title_el.get_text(strip=True) if title_el else None
+    tree = lxml_html.fromstring(html)
 
-    price_el = soup.select_one(".product_main .price_color")
-    price = price_el.get_text(strip=True) if price_el else None
+    def _first_text(sel: CSSSelector) -> str | None:
+        els = sel(tree)
+        if not els:
+            return None
+        return " ".join(els[0].text_content().split()) or None
 
-    avail_el = soup.select_one(".product_main .availability")
-    availability = avail_el.get_text(strip=True) if avail_el else None
+    title = _first_text(_TITLE_SEL)
+    price = _first_text(_PRICE_SEL)
+    availability = _first_text(_AVAIL_SEL)
 
-    return {
-        "title": title,
-        "price": price,
-        "availability": availability,
-        "asin": None,
-        "sku": None,
-    }
\ No newline at end of file
+    return Product(
+        title=title,
+        price=price,
+        availability=availability,
+    )
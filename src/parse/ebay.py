@@ -1,70 +1,163 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup
-import typing as t
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from ..product import Product
+
+# Selectors compiled once at import; see amazon.py for rationale.
+# Old layout: #itemTitle carries a "Details about  " prefix handled below.
+_TITLE_OLD_SEL = CSSSelector("#itemTitle")
+_TITLE_SELS = [
+    CSSSelector(s)
+    for s in (
+        "h1.x-item-title__mainTitle span.ux-textspans",  # new layout
+        "h1[itemprop='name']",
+        "h1.ux-textspans",
+    )
+]
+_PRICE_SELS = [
+    CSSSelector(s)
+    for s in (
+        "#mm-saleDscPrc",  # old layout
+        "#prcIsum",
+        "span[itemprop='price']",  # often carries a content attribute
+        ".x-price-primary .ux-textspans",  # new layout
+    )
+]
+_AVAIL_SELS = [
+    CSSSelector(s)
+    for s in (
+        "#qtySubTxt",  # old
+        ".d-quantity__availability",  # old
+        ".x-quantity__availability .ux-textspans",  # new
+        "[data-testid='x-buybox-availability'] .ux-textspans",
+    )
+]
 
 
 def _text(el) -> str | None:
-    return el.get_text(strip=True) if el else None
+    if el is None:
+        return None
+    # itertext so this works on both lxml.html and plain etree elements
+    txt = " ".join("".join(el.itertext()).split())
+    return txt or None
 
 
-def parse_product(html: str) -> t.Dict[str, t.Optional[str]]:
-    """
-    Parse an eBay product page (new/old layouts).
-    Returns: title, price, availability, asin(None), sku(None)
-    """
-    soup = BeautifulSoup(html, "lxml")
-
-    # --- Title (several layouts) ---
-    title = None
-    # Old layout: #itemTitle with leading "Details about  " text
-    t1 = soup.select_one("#itemTitle")
-    if t1:
-        txt = _text(t1)
-        if txt:
-            title = txt.replace("Details about  ", "").strip() or None
-    # New layout:
+# Feed size for the pull parser; title/price/availability live in the first
+# fraction of eBay's multi-megabyte pages, so most feeds stop early.
+_FEED_CHUNK = 65536
+
+
+def _has_ancestor(el, cls: str | None = None, testid: str | None = None) -> bool:
+    p = el.getparent()
+    while p is not None:
+        if cls and cls in (p.get("class") or ""):
+            return True
+        if testid and p.get("data-testid") == testid:
+            return True
+        p = p.getparent()
+    return False
+
+
+def _match_event(el, found: dict) -> None:
+    """Fill `found` from one end-tag event; mirrors the selector lists."""
+    eid = el.get("id")
+    cls = el.get("class") or ""
+    if found["title"] is None:
+        if eid == "itemTitle":
+            # Strip the prefix before collapsing whitespace (it ends in a
+            # double space in the raw markup)
+            raw = "".join(el.itertext()).removeprefix("Details about  ")
+            found["title"] = " ".join(raw.split()) or None
+        elif "ux-textspans" in cls and _has_ancestor(el, cls="x-item-title__mainTitle"):
+            found["title"] = _text(el)
+        elif el.tag == "h1" and el.get("itemprop") == "name":
+            found["title"] = _text(el)
+    if found["price"] is None:
+        if eid in ("mm-saleDscPrc", "prcIsum"):
+            found["price"] = _text(el)
+        elif el.get("itemprop") == "price":
+            found["price"] = el.get("content") or _text(el)
+        elif "ux-textspans" in cls and _has_ancestor(el, cls="x-price-primary"):
+            found["price"] = _text(el)
+    if found["availability"] is None:
+        if eid == "qtySubTxt" or "d-quantity__availability" in cls:
+            found["availability"] = _text(el)
+        elif "ux-textspans" in cls and (
+            _has_ancestor(el, cls="x-quantity__availability")
+            or _has_ancestor(el, testid="x-buybox-availability")
+        ):
+            found["availability"] = _text(el)
+
+
+def _parse_tree(tree, found: dict) -> Product:
+    """Selector-list pass over a full tree, keeping event-found values."""
+    title = found["title"]
     if not title:
-        t2 = soup.select_one("h1.x-item-title__mainTitle span.ux-textspans")
-        title = _text(t2) or title
+        els = _TITLE_OLD_SEL(tree)
+        if els:
+            raw = "".join(els[0].itertext()).removeprefix("Details about  ")
+            title = " ".join(raw.split()) or None
     if not title:
-        t3 = soup.select_one("h1[itemprop='name'], h1.ux-textspans")
-        title = _text(t3) or title
-
-    # --- Price (several layouts) ---
-    price = None
-    # Old layout:
-    for sel in ("#mm-saleDscPrc", "#prcIsum", "span[itemprop='price']"):
-        el = soup.select_one(sel)
-        if el:
-            # itemprop=price often has content attribute
-            price = el.get("content") or _text(el)
-            if price:
-                break
-    # New layout:
-    if not price:
-        el = soup.select_one(".x-price-primary .ux-textspans")
-        price = _text(el) or price
+        for sel in _TITLE_SELS:
+            els = sel(tree)
+            if els:
+                title = _text(els[0])
+                if title:
+                    break
+
+    price = found["price"]
     if not price:
-        el = soup.select_one("span[itemprop='price']")  # fallback
-        price = el.get("content") if el and el.get("content") else price
-
-    # --- Availability (best-effort) ---
-    availability = None
-    for sel in (
-            "#qtySubTxt",  # old
-            ".d-quantity__availability",  # old
-            ".x-quantity__availability .ux-textspans",  # new
-            "[data-testid='x-buybox-availability'] .ux-textspans",
-    ):
-        availability = _text(soup.select_one(sel))
-        if availability:
-            break
+        for sel in _PRICE_SELS:
+            els = sel(tree)
+            if els:
+                price = els[0].get("content") or _text(els[0])
+                if price:
+                    break
+
+    availability = found["availability"]
+    if not availability:
+        for sel in _AVAIL_SELS:
+            els = sel(tree)
+            if els:
+                availability = _text(els[0])
+                if availability:
+                    break
 
     # eBay pages don't expose ASIN; SKU/item number sometimes appears but unstable.
-    return {
-        "title": title,
-        "price": price,
-        "availability": availability,
-        "asin": None,
-        "sku": None,
-    }
+    return Product(
+        title=title,
+        price=price,
+        availability=availability,
+    )
+
+
+def parse_product(html: str) -> Product:
+    """
+    Parse an eBay product page (new/old layouts).
+    Fills: title, price, availability; ASIN/SKU stay None.
+
+    Pull-parses in 64 KB chunks and returns as soon as all three fields
+    have been seen, so the long tail (reviews, related items, scripts)
+    usually never gets parsed. Falls back to a full-tree selector pass
+    when a field doesn't surface from the events.
+    """
+    parser = etree.HTMLPullParser(events=("end",))
+    found: dict = {"title": None, "price": None, "availability": None}
+    try:
+        for start in range(0, len(html), _FEED_CHUNK):
+            parser.feed(html[start:start + _FEED_CHUNK])
+            for _, el in parser.read_events():
+                _match_event(el, found)
+            if all(found.values()):
+                return Product(**found)
+    except etree.XMLSyntaxError:
+        pass
+
+    # Unseen layout or truncated markup: finish this tree if possible and
+    # run the selector lists over whatever is missing.
+    try:
+        tree = parser.close()
+    except Exception:
+        tree = lxml_html.fromstring(html)
+    return _parse_tree(tree, found)
@@ -1,17 +1,56 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup
+from functools import lru_cache
 
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
 
-def extract_title(html: str) -> str | None:
-    soup = BeautifulSoup(html, "lxml")
-    if soup.title and soup.title.string:
-        return soup.title.string.strip()
+# Feed size for the pull parser below; one chunk usually covers <head>.
+_CHUNK = 8192
+
+
+def extract_title(source) -> str | None:
+    """Return the document <title>, or None.
+
+    `source` may be raw HTML or an already-parsed lxml tree — callers that
+    hold a tree from their own parse shouldn't pay for a second one. Raw
+    HTML is fed to a pull parser in chunks with an early bail at the first
+    </title>: the tag lives in <head>, so only the head of a long product
+    page gets parsed instead of the full document tree.
+    """
+    if not isinstance(source, str):
+        el = source.find(".//title")
+        if el is None:
+            return None
+        return "".join(el.itertext()).strip() or None
+
+    html = source
+    parser = etree.HTMLPullParser(events=("end",), tag="title")
+    try:
+        for start in range(0, len(html), _CHUNK):
+            parser.feed(html[start:start + _CHUNK])
+            for _, el in parser.read_events():
+                text = "".join(el.itertext()).strip()
+                return text or None
+        # Flush so a title left unclosed by broken markup still surfaces
+        parser.close()
+        for _, el in parser.read_events():
+            text = "".join(el.itertext()).strip()
+            return text or None
+    except etree.XMLSyntaxError:
+        pass
     return None
 
 
-def extract_text_by_selector(html: str, selector: str) -> str | None:
-    soup = BeautifulSoup(html, "lxml")
-    el = soup.select_one(selector)
-    if el:
-        return el.get_text(strip=True)
+@lru_cache(maxsize=64)
+def _css(selector: str) -> CSSSelector:
+    """Compiled selector; callers pass a handful of literal strings."""
+    return CSSSelector(selector)
+
+
+def extract_text_by_selector(source, selector: str) -> str | None:
+    """First match for `selector`; `source` may be HTML or a parsed tree."""
+    tree = lxml_html.fromstring(source) if isinstance(source, str) else source
+    els = _css(selector)(tree)
+    if els:
+        return " ".join(els[0].text_content().split()) or None
     return None
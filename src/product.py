@@ -0,0 +1,23 @@
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+
+@dataclass(slots=True)
+class Product:
+    """Parsed product fields, one instance per page.
+
+    slots=True drops the per-instance __dict__, so long run_list batches
+    holding many results stay lean and field access skips a dict lookup.
+    Converted to a plain dict only at the cache/diff/sheet boundaries.
+    """
+
+    title: Optional[str] = None
+    price: Optional[str] = None
+    availability: Optional[str] = None
+    asin: Optional[str] = None
+    sku: Optional[str] = None
+    source_url: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return asdict(self)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 import signal
-import sys
-from datetime import datetime
+import threading
 from typing import Callable, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -24,23 +23,26 @@ def run_forever(add_jobs: Callable[[BackgroundScheduler], None]) -> None:
     sched.start()
     log.info("Scheduler started (timezone: %s). Press Ctrl+C to stop.", tz)
 
+    stop_evt = threading.Event()
+
     def _shutdown(signum, frame):
         log.info("Signal %s received, shutting down scheduler...", signum)
+        try:
+            # Push out any rows a running job has buffered (lazy import to
+            # keep the scheduler usable without the sheets dependencies)
+            from . import sheets
+            sheets.flush_batch()
+        except Exception:
+            pass
         sched.shutdown(wait=False)
-        sys.exit(0)
+        stop_evt.set()
 
     signal.signal(signal.SIGINT, _shutdown)
     signal.signal(signal.SIGTERM, _shutdown)
 
-    # Simple wait loop
-    try:
-        while True:
-            signal.pause()
-    except AttributeError:
-        # Windows fallback
-        import time
-        while True:
-            time.sleep(1)
+    # Event.wait() parks the main thread until _shutdown fires — no wake-ups,
+    # and it works on Windows too (the old fallback polled at 1 Hz there)
+    stop_evt.wait()
 
 
 
@@ -59,6 +61,39 @@ def add_interval_job(
     log.info("Added interval job: every %d min (jitter ~%ds)", every_minutes, jitter_seconds)
 
 
+def add_parallel_interval_job(
+    sched: BackgroundScheduler,
+    funcs: list[Callable],
+    every_minutes: int,
+    max_workers: int = 8,
+    jitter_seconds: int = 15,
+    job_id: Optional[str] = None,
+) -> None:
+    """
+    Add one interval job that runs `funcs` concurrently in a thread pool.
+
+    A single scheduler slot (max_instances=1, coalesce=True) fans the
+    callables out over up to `max_workers` threads, so N tracked URLs cost
+    one APScheduler job and a cycle takes roughly the slowest fetch instead
+    of the sum. Each callable's exceptions surface via ex.map, so a failing
+    URL aborts the remainder of that cycle — wrap per-URL error handling
+    inside the callables (see _job_run_once).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _run_all() -> None:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            # list() drains the iterator so worker exceptions propagate here
+            list(ex.map(lambda f: f(), funcs))
+
+    trigger = IntervalTrigger(minutes=every_minutes, jitter=jitter_seconds)
+    sched.add_job(_run_all, trigger=trigger, id=job_id, max_instances=1, coalesce=True)
+    log.info(
+        "Added parallel interval job: %d task(s) every %d min (%d workers)",
+        len(funcs), every_minutes, max_workers,
+    )
+
+
 # --- New helper: add_daily_at ---
 
 def add_daily_at(
@@ -80,7 +115,9 @@ def add_daily_at(
     except Exception:
         raise ValueError("time_str must be 'HH:MM' in 24h format, e.g. '09:00'")
 
-    trigger = CronTrigger(minute=str(mm_i), hour=str(hh_i))
+    # Ints go straight through; stringifying them just made APScheduler
+    # re-parse the fields
+    trigger = CronTrigger(minute=mm_i, hour=hh_i, timezone=sched.timezone)
     sched.add_job(func, trigger=trigger, id=job_id, max_instances=1, coalesce=True)
     log.info("Added daily job: %02d:%02d local time", hh_i, mm_i)
 
@@ -96,10 +133,10 @@ def add_cron_job(
       - '0 * * * *'  → every hour at :00
       - '0 9 * * *'  → every day 09:00
     """
-    fields = cron_expr.split()
-    if len(fields) != 5:
+    if len(cron_expr.split()) != 5:
         raise ValueError("Cron expression must have 5 fields (min hour dom mon dow)")
-    minute, hour, day, month, dow = fields
-    trigger = CronTrigger(minute=minute, hour=hour, day=day, month=month, day_of_week=dow)
+    # from_crontab is APScheduler's own crontab parser — one pass instead of
+    # our split + per-field keyword dispatch
+    trigger = CronTrigger.from_crontab(cron_expr, timezone=sched.timezone)
     sched.add_job(func, trigger=trigger, id=job_id, max_instances=1, coalesce=True)
     log.info("Added cron job: %s", cron_expr)
\ No newline at end of file
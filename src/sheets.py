@@ -1,7 +1,14 @@
 from __future__ import annotations
+import atexit
 import os
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, Optional, List
 import gspread
+from gspread.exceptions import APIError
 from google.oauth2.service_account import Credentials
 from .log import get_logger
 
@@ -10,9 +17,13 @@ log = get_logger("sheets")
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
 
+@lru_cache(maxsize=1)
 def _get_client() -> gspread.Client:
     """
     Build a gspread client from a service account JSON path in .env.
+
+    Cached: authorization costs a token round-trip, and every write/read
+    helper used to pay it again.
     """
     sa_file = os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE")
     if not sa_file or not os.path.exists(sa_file):
@@ -24,51 +35,195 @@ def _get_client() -> gspread.Client:
     return gspread.authorize(creds)
 
 
+# Worksheet handles cached per (sheet_id, name): open_by_key + worksheet()
+# are 2 HTTPS round-trips that otherwise recur on every append. Entries age
+# out after _WS_TTL so long-lived scheduler processes pick up renamed or
+# recreated tabs eventually.
+_WS_TTL = 600.0
+_WS_CACHE: Dict[tuple, tuple] = {}  # (sheet_id, ws_name) -> (monotonic ts, ws)
+
+
+def _get_ws(ws_name: str, add_missing: bool = False):
+    """Cached worksheet handle for (GOOGLE_SHEET_ID, `ws_name`)."""
+    sheet_id = os.getenv("GOOGLE_SHEET_ID")
+    if not sheet_id:
+        raise ValueError("GOOGLE_SHEET_ID is not set in .env")
+    key = (sheet_id, ws_name)
+    hit = _WS_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < _WS_TTL:
+        return hit[1]
+    sh = _get_client().open_by_key(sheet_id)
+    try:
+        ws = sh.worksheet(ws_name)
+    except Exception:
+        if not add_missing:
+            raise
+        ws = sh.add_worksheet(title=ws_name, rows="100", cols="8")
+    _WS_CACHE[key] = (time.monotonic(), ws)
+    return ws
+
+
+def _ws_call(ws_name: str, op, add_missing: bool = False):
+    """Run `op(worksheet)`; on an auth APIError (401/403, e.g. an expired
+    token on a cached handle) drop the caches and retry once fresh."""
+    ws = _get_ws(ws_name, add_missing=add_missing)
+    try:
+        return op(ws)
+    except APIError as e:
+        code = getattr(getattr(e, "response", None), "status_code", None)
+        if code not in (401, 403):
+            raise
+        _WS_CACHE.clear()
+        _HEADER_OK.clear()
+        _get_client.cache_clear()
+        ws = _get_ws(ws_name, add_missing=add_missing)
+        return op(ws)
+
+
 def _open_worksheet():
     """
     Open the target worksheet based on GOOGLE_SHEET_ID and GOOGLE_SHEET_WORKSHEET.
     """
-    sheet_id = os.getenv("GOOGLE_SHEET_ID")
-    ws_name = os.getenv("GOOGLE_SHEET_WORKSHEET", "Sheet1")
-    if not sheet_id:
-        raise ValueError("GOOGLE_SHEET_ID is not set in .env")
-    client = _get_client()
-    sh = client.open_by_key(sheet_id)
-    return sh.worksheet(ws_name)
+    return _get_ws(os.getenv("GOOGLE_SHEET_WORKSHEET", "Sheet1"))
+
+
+_HEADER_OK: set = set()  # (spreadsheet_id, title) pairs with a verified header
 
 
 def _ensure_header(ws, header: List[str]) -> None:
     """
     Ensure the first row equals the desired header (create or update if needed).
+
+    Checked once per worksheet per process — the header never changes after
+    that, and the row_values(1) read was an extra round-trip on every write.
     """
+    key = (ws.spreadsheet_id, ws.title)
+    if key in _HEADER_OK:
+        return
     try:
         existing = ws.row_values(1)
     except Exception:
         existing = []
     if existing != header:
         # Either empty or mismatched header → overwrite row 1
-        ws.update("A1", [header])  # gspread expects a list of rows
+        # (values-first argument order; the legacy order goes through a
+        # per-call deprecation shim in gspread 6)
+        ws.update([header], "A1")
+    _HEADER_OK.add(key)
+
+
+_PRODUCT_HEADER = ["title", "price", "availability", "asin", "sku", "source_url"]
+
+
+# --- Batched writes ---
+# cmd_run_list brackets its loop with begin_batch()/flush_batch(): while
+# batching is on, write_product_row and append_log queue rows in memory and
+# ship them with one append_rows call per _BATCH_FLUSH_EVERY rows (plus a
+# final one at flush), instead of a Sheets API round-trip per row.
+
+_BATCH_FLUSH_EVERY = 20
+_batch_lock = threading.Lock()
+_batching = False
+_pending_products: List[List[str]] = []
+_pending_logs: List[List[str]] = []
+
+
+def begin_batch() -> None:
+    """Start buffering product/log appends; pair with flush_batch()."""
+    global _batching
+    with _batch_lock:
+        _batching = True
+
+
+def flush_batch() -> None:
+    """Write out any buffered rows and turn buffering off."""
+    global _batching
+    with _batch_lock:
+        _batching = False
+        products, logs = _pending_products[:], _pending_logs[:]
+        _pending_products.clear()
+        _pending_logs.clear()
+    _flush_products(products)
+    _flush_logs(logs)
+
+
+# Safety net: if the process exits mid-batch (unhandled exception, sys.exit
+# from a signal handler), buffered rows still go out. A no-op when the
+# buffers are empty.
+atexit.register(flush_batch)
+
+
+def _buffer(buf: List[List[str]], row: List[str], flush_fn) -> bool:
+    """Queue `row` when batching is on; flush `buf` once it hits the cap.
+
+    Returns False when batching is off so the caller writes directly.
+    The flush itself runs outside the lock (it is network I/O).
+    """
+    with _batch_lock:
+        if not _batching:
+            return False
+        buf.append(row)
+        if len(buf) < _BATCH_FLUSH_EVERY:
+            return True
+        rows = buf[:]
+        buf.clear()
+    flush_fn(rows)
+    return True
+
+
+def _flush_products(rows: List[List[str]]) -> None:
+    try:
+        _append_product_rows(rows)
+    except Exception as e:
+        log.warning("Batched product write failed (%d rows dropped): %r", len(rows), e)
+
+
+def _flush_logs(rows: List[List[str]]) -> None:
+    try:
+        _append_log_rows(rows)
+    except Exception as e:
+        log.warning("Batched log write failed (%d rows dropped): %r", len(rows), e)
+
+
+# One itemgetter walk instead of six data.get() calls per row; the `or ""`
+# in the comprehension keeps missing *and* None/empty fields as blanks.
+_pick_product = itemgetter(*_PRODUCT_HEADER)
+_PRODUCT_BLANKS = dict.fromkeys(_PRODUCT_HEADER, "")
+
+
+def _build_product_row(data: Dict[str, Optional[str]]) -> List[str]:
+    return [v or "" for v in _pick_product({**_PRODUCT_BLANKS, **data})]
+
+
+def _append_product_rows(rows: List[List[str]]) -> None:
+    if not rows:
+        return
+
+    def _op(ws):
+        _ensure_header(ws, _PRODUCT_HEADER)
+        ws.append_rows(rows, value_input_option="USER_ENTERED")
+
+    _ws_call(os.getenv("GOOGLE_SHEET_WORKSHEET", "Sheet1"), _op)
+    # Per-row success noise; DEBUG keeps scheduled runs' logs to real events
+    log.debug("Appended %d row(s) to Google Sheet.", len(rows))
 
 
 def write_product_row(data: Dict[str, Optional[str]]) -> None:
     """
     Append a product row with a stable header. Missing fields become empty strings.
+
+    While batching is on (see begin_batch) the row is queued instead and
+    written with the next flush.
     """
-    header = ["title", "price", "availability", "asin", "sku", "source_url"]
-    ws = _open_worksheet()
-    _ensure_header(ws, header)
+    row = _build_product_row(data)
+    if _buffer(_pending_products, row, _flush_products):
+        return
+    _append_product_rows([row])
 
-    row = [
-        data.get("title") or "",
-        data.get("price") or "",
-        data.get("availability") or "",
-        data.get("asin") or "",
-        data.get("sku") or "",
-        data.get("source_url") or "",
-    ]
 
-    ws.append_row(row, value_input_option="USER_ENTERED")
-    log.info("Row appended to Google Sheet.")
+def write_product_rows(items: List[Dict[str, Optional[str]]]) -> None:
+    """Append several product rows with a single Sheets API call."""
+    _append_product_rows([_build_product_row(d) for d in items])
 
 
 # --- Diff lookup support ---
@@ -81,31 +236,58 @@ def _get_all_rows(ws) -> List[List[str]]:
         return []
 
 
+_HEADER_CACHE: Dict[tuple, List[str]] = {}
+
+
+def _header_of(ws) -> List[str]:
+    """Header row of `ws`, cached; the header never changes once written."""
+    key = (ws.spreadsheet_id, ws.title)
+    header = _HEADER_CACHE.get(key)
+    if header is None:
+        try:
+            header = ws.row_values(1)
+        except Exception:
+            header = []
+        if header:
+            _HEADER_CACHE[key] = header
+    return header or []
+
+
 def get_last_row_by_url(source_url: str) -> Optional[Dict[str, str]]:
     """Return the last row (as a dict) that matches `source_url`, or None."""
     ws = _open_worksheet()
-    rows = _get_all_rows(ws)
-    if not rows:
+
+    header = _header_of(ws)
+    if "source_url" not in header:
+        # No header yet
         return None
+    url_idx = header.index("source_url")
 
-    header = rows[0]
-    idx_by_name = {name: i for i, name in enumerate(header)}
+    # Fetch just the URL column, then the single matching row: O(rows) plus
+    # O(cols) cells over the wire instead of the whole O(rows * cols) sheet.
+    # gspread's find() still downloads everything internally, so the bounded
+    # column read is the cheaper server-side option here.
     try:
-        url_idx = idx_by_name["source_url"]
-    except KeyError:
-        # No header yet
+        col = ws.col_values(url_idx + 1)
+        for r in range(len(col), 1, -1):  # last match wins; row 1 is the header
+            if col[r - 1] == source_url:
+                row = ws.row_values(r)
+                return {name: (row[i] if i < len(row) else "") for i, name in enumerate(header)}
         return None
+    except Exception as e:
+        log.warning("Column lookup failed, falling back to full scan: %r", e)
 
+    rows = _get_all_rows(ws)
+    if not rows:
+        return None
     for row in reversed(rows[1:]):
         if url_idx < len(row) and row[url_idx] == source_url:
-            data: Dict[str, str] = {}
-            for name, i in idx_by_name.items():
-                data[name] = row[i] if i < len(row) else ""
-            return data
+            return {name: (row[i] if i < len(row) else "") for i, name in enumerate(header)}
     return None
 
 
 # --- Inputs sheet support ---
+_TRUTHY = frozenset({"1", "true", "yes", "y"})
 def get_input_urls() -> List[Dict[str, object]]:
     """Read list of URL configs from Inputs worksheet.
 
@@ -120,22 +302,22 @@ def get_input_urls() -> List[Dict[str, object]]:
 
     Returns list of dicts: {url, enabled, price_delta_pct, alert_on_availability}
     """
-    sheet_id = os.getenv("GOOGLE_SHEET_ID")
-    if not sheet_id:
-        raise ValueError("GOOGLE_SHEET_ID is not set in .env")
-
     ws_name = os.getenv("INPUT_SHEET_NAME", "Inputs")
-    client = _get_client()
-    sh = client.open_by_key(sheet_id)
-
     try:
-        ws = sh.worksheet(ws_name)
+        ws = _get_ws(ws_name)
+    except ValueError:
+        raise
     except Exception as e:
         raise RuntimeError(
             f"Inputs worksheet '{ws_name}' not found. Create it with header: url, enabled, price_delta_pct, alert_on_availability"
         ) from e
 
-    values = ws.get_all_values()
+    # The parser only reads the seven documented columns — fetch just that
+    # range instead of every cell in the grid (cf. the digest's A1:E read).
+    try:
+        values = ws.get("A1:G")
+    except Exception:
+        values = ws.get_all_values()
     if not values:
         return []
 
@@ -153,48 +335,50 @@ def get_input_urls() -> List[Dict[str, object]]:
     proxy_idx = header.index("proxy") if "proxy" in header else None
 
     configs: List[Dict[str, object]] = []
-    truthy = {"1", "true", "yes", "y"}
 
+    # Pad short rows to the header width once so the per-field bounds
+    # checks the old loop carried everywhere disappear.
+    width = len(header)
     for row in values[1:]:
-        if url_idx >= len(row):
-            continue
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
         url = (row[url_idx] or "").strip()
         if not url:
             continue
 
         enabled = True
         if enabled_idx is not None:
-            flag = (row[enabled_idx] or "").strip().lower() if enabled_idx < len(row) else ""
-            if flag and flag not in truthy:
-                enabled = False
+            flag = (row[enabled_idx] or "").strip().lower()
+            # Blank defaults to enabled; otherwise one set probe decides
+            enabled = not flag or flag in _TRUTHY
 
         price_delta_pct: float | None = None
-        if price_delta_idx is not None and price_delta_idx < len(row):
+        if price_delta_idx is not None:
             try:
                 price_delta_pct = float(row[price_delta_idx]) if row[price_delta_idx] else None
             except ValueError:
                 price_delta_pct = None
 
         alert_on_avail: bool | None = None
-        if avail_idx is not None and avail_idx < len(row):
+        if avail_idx is not None:
             flag = (row[avail_idx] or "").strip().lower()
             if flag:
-                alert_on_avail = flag in truthy
+                alert_on_avail = flag in _TRUTHY
 
         delay_seconds: float | None = None
-        if delay_idx is not None and delay_idx < len(row):
+        if delay_idx is not None:
             try:
                 delay_seconds = float(row[delay_idx]) if row[delay_idx] else None
             except ValueError:
                 delay_seconds = None
 
         user_agent: str | None = None
-        if ua_idx is not None and ua_idx < len(row):
+        if ua_idx is not None:
             ua = (row[ua_idx] or "").strip()
             user_agent = ua or None
 
         proxy: str | None = None
-        if proxy_idx is not None and proxy_idx < len(row):
+        if proxy_idx is not None:
             p = (row[proxy_idx] or "").strip()
             proxy = p or None
 
@@ -214,6 +398,24 @@ def get_input_urls() -> List[Dict[str, object]]:
 
 
 # --- Logs sheet support ---
+_LOG_HEADER = ["timestamp", "url", "status", "title", "summary", "wrote", "alerted", "error"]
+
+# Same shape as the old isoformat(timespec="seconds") + "Z" timestamps.
+_TS_FMT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _append_log_rows(rows: List[List[str]]) -> None:
+    if not rows:
+        return
+
+    def _op(ws):
+        _ensure_header(ws, _LOG_HEADER)
+        ws.append_rows(rows, value_input_option="USER_ENTERED")
+
+    _ws_call(os.getenv("LOG_SHEET_NAME", "Logs"), _op, add_missing=True)
+    log.debug("Appended %d log row(s).", len(rows))
+
+
 def append_log(
     url: str,
     status: str,
@@ -226,28 +428,16 @@ def append_log(
     """
     Append a log entry into a Logs worksheet (name from LOG_SHEET_NAME env, default "Logs").
     Header: timestamp | url | status | title | summary | wrote | alerted | error
-    """
-    import datetime
 
+    While batching is on (see begin_batch) the entry is queued instead and
+    written with the next flush; the timestamp is taken at call time.
+    """
     sheet_id = os.getenv("GOOGLE_SHEET_ID")
     if not sheet_id:
         log.warning("No GOOGLE_SHEET_ID set, skip append_log.")
         return
 
-    ws_name = os.getenv("LOG_SHEET_NAME", "Logs")
-    client = _get_client()
-    sh = client.open_by_key(sheet_id)
-
-    try:
-        ws = sh.worksheet(ws_name)
-    except Exception:
-        # Create if missing
-        ws = sh.add_worksheet(title=ws_name, rows="100", cols="8")
-
-    header = ["timestamp", "url", "status", "title", "summary", "wrote", "alerted", "error"]
-    _ensure_header(ws, header)
-
-    ts = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    ts = datetime.now(timezone.utc).strftime(_TS_FMT)
 
     row = [
         ts,
@@ -259,34 +449,42 @@ def append_log(
         "yes" if alerted else "no",
         error or "",
     ]
-    ws.append_row(row, value_input_option="USER_ENTERED")
-    log.info("Log row appended.")
+    if _buffer(_pending_logs, row, _flush_logs):
+        return
+    _append_log_rows([row])
 
 
 # --- CSV export support ---
-def export_sheet_to_csv(sheet_name: str, out_path: str, since_hours: int | None = None) -> int:
+def export_sheet_to_csv(
+    sheet_name: str,
+    out_path: Optional[str] = None,
+    since_hours: int | None = None,
+    buffer=None,
+) -> int:
     """
-    Export rows from a given Google Sheet worksheet to a local CSV file.
+    Export rows from a given Google Sheet worksheet to CSV.
 
     Args:
         sheet_name: Name of the worksheet/tab to export (e.g. "Snapshots")
         out_path: Local filename to write the CSV to
         since_hours: If set, only include rows whose first column (timestamp)
                      is newer than now - since_hours. Assumes ISO8601 timestamp.
+        buffer: Binary file-like object to write the CSV to instead of disk
+                (used by the dashboard download button to avoid the
+                write-then-read round-trip). Exactly one of out_path/buffer
+                must be provided.
 
     Returns:
         0 on success
     """
     import csv
     import datetime
+    import io
 
-    sheet_id = os.getenv("GOOGLE_SHEET_ID")
-    if not sheet_id:
-        raise ValueError("GOOGLE_SHEET_ID is not set in .env")
+    if (out_path is None) == (buffer is None):
+        raise ValueError("Provide exactly one of out_path or buffer")
 
-    client = _get_client()
-    sh = client.open_by_key(sheet_id)
-    ws = sh.worksheet(sheet_name)
+    ws = _get_ws(sheet_name)
 
     rows = _get_all_rows(ws)
     if not rows:
@@ -310,10 +508,18 @@ def export_sheet_to_csv(sheet_name: str, out_path: str, since_hours: int | None
         except Exception as e:
             log.warning("Failed to filter by since_hours: %r", e)
 
-    with open(out_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
+    if buffer is not None:
+        wrapper = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        writer = csv.writer(wrapper)
         writer.writerow(header)
         writer.writerows(data_rows)
-
-    log.info("Exported %d rows from sheet '%s' to %s", len(data_rows), sheet_name, out_path)
+        wrapper.flush()
+        wrapper.detach()  # leave the underlying buffer open for the caller
+        log.info("Exported %d rows from sheet '%s' to buffer", len(data_rows), sheet_name)
+    else:
+        with open(out_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(data_rows)
+        log.info("Exported %d rows from sheet '%s' to %s", len(data_rows), sheet_name, out_path)
     return 0
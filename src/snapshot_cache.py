@@ -0,0 +1,55 @@
+from __future__ import annotations
+import os
+import threading
+from typing import Dict, Optional
+
+from . import jsonio
+from .config import CACHE_DIR
+from .log import get_logger
+
+log = get_logger("snapshot_cache")
+
+# Local mirror of the last row written to the sheet per URL. The diff only
+# needs that one row, so serving it from here avoids the full-sheet read
+# behind get_last_row_by_url on every cycle; Sheets stays the fallback on a
+# cache miss. Persisted to a JSON sidecar like the other .cache/ files so
+# scheduled runs keep benefiting across restarts.
+
+_CACHE_PATH = os.path.join(CACHE_DIR, "snapshots.json")
+_lock = threading.Lock()
+_cache: Dict[str, Dict[str, str]] | None = None
+
+
+def _load() -> Dict[str, Dict[str, str]]:
+    global _cache
+    if _cache is None:
+        try:
+            with open(_CACHE_PATH, "rb") as f:
+                _cache = jsonio.loads(f.read())
+        except Exception:
+            _cache = {}
+    return _cache
+
+
+def get_last(url: str) -> Optional[Dict[str, str]]:
+    """Return the last row written for `url`, or None when not cached."""
+    with _lock:
+        row = _load().get(url)
+        return dict(row) if row else None
+
+
+def set_last(url: str, data: Dict[str, Optional[str]]) -> None:
+    """Record `data` as the most recent row written for `url` (atomic replace)."""
+    # Mirror sheet semantics: missing fields come back as empty strings
+    row = {k: (v or "") for k, v in data.items()}
+    with _lock:
+        cache = _load()
+        cache[url] = row
+        try:
+            os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+            tmp = _CACHE_PATH + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(jsonio.dumps(cache))
+            os.replace(tmp, _CACHE_PATH)
+        except Exception as e:
+            log.debug("Snapshot cache write failed: %r", e)